@@ -4,6 +4,8 @@ import abc
 
 
 class BaseDevice(abc.ABC):
+    __slots__ = ()  # lets subclasses that declare __slots__ skip __dict__
+
     name: str
 
     @abc.abstractmethod
@@ -20,6 +22,8 @@ class BaseDevice(abc.ABC):
 
 
 class BaseShutter(BaseDevice):
+    __slots__ = ()
+
     @abc.abstractmethod
     def open(self) -> None: ...
 
@@ -31,11 +35,19 @@ class BaseShutter(BaseDevice):
 
 
 class BaseAmmeter(BaseDevice):
+    __slots__ = ()
+
     @abc.abstractmethod
     def read_current(self) -> float: ...  # amps
 
+    @property
+    @abc.abstractmethod
+    def last_current(self) -> float | None: ...  # amps, no new reading
+
 
 class BaseFilterWheel(BaseDevice):
+    __slots__ = ()
+
     slots: int = 6
 
     @abc.abstractmethod
@@ -10,24 +10,66 @@ Capabilities
 • list_wheels(), wheel_status(), etc. – per‑wheel helpers
 • available_filters()                 – global lookup
 • Robust to unplugged wheels           (kept in .offline list)
+• reconnect()                         – retry offline wheels, rebuild lookups
 """
 
 from __future__ import annotations
 
+import bisect
+import copy
+import logging
 import math
+import os
 import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import yaml
 
+try:  # libyaml C bindings are much faster when available
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 from .thorlabs_fw import FilterWheel, ThorlabsError
 
+_log = logging.getLogger(__name__)
+
 BP = "bandpass"
 ND = "nd"
 
 __all__ = ["FilterRack"]
 
+# (path, size, mtime_ns) -> (wheels_cfg, filter_meta); avoids re‑parsing an
+# unchanged config when the rack is rebuilt in the same process.
+_CFG_CACHE: Dict[Tuple[str, int, int], Tuple[dict, dict]] = {}
+
+
+def _load_config(path: str | Path) -> Tuple[dict, dict]:
+    """Return ``(filter_wheels, filters)`` sections of the YAML at *path*.
+
+    Parsed results are cached by file size + mtime; callers get deep copies so
+    the cached dicts are never mutated.
+    """
+    st = os.stat(path)
+    key = (str(Path(path).resolve()), st.st_size, st.st_mtime_ns)
+    cached = _CFG_CACHE.get(key)
+    if cached is None:
+        with open(path, "rb") as f:
+            cfg = yaml.load(f, Loader=_Loader) or {}
+        cached = (cfg.get("filter_wheels") or {}, cfg.get("filters") or {})
+        _CFG_CACHE[key] = cached
+    return copy.deepcopy(cached)
+
+
+def _nearest(keys: List[float], target: float, tol: float) -> Optional[float]:
+    """Closest value to *target* in sorted *keys* within *tol*, else None."""
+    i = bisect.bisect_left(keys, target)
+    cands = keys[max(i - 1, 0) : i + 1]  # neighbours on either side
+    best = min(cands, key=lambda k: abs(target - k), default=None)
+    return best if best is not None and abs(target - best) <= tol else None
+
 
 class FilterRack:
     # ------------------------------------------------------------------
@@ -37,6 +79,9 @@ class FilterRack:
 
         self.offline: List[str] = [k for k, w in wheels.items() if not w.is_connected()]
         self.online: List[str] = [k for k in wheels if k not in self.offline]
+        self.bp_online: List[str] = []
+        self.nd_online: List[str] = []
+        self._split_online()
 
         # Build lookup tables
         self._wl_index: Dict[float, Tuple[str, int, str]] = (
@@ -45,28 +90,68 @@ class FilterRack:
         self._nd_index: Dict[float, Tuple[str, int, str]] = (
             {}
         )  # OD -> (wheel,slot,name)
+        self._wl_sorted: List[float] = []
+        self._nd_sorted: List[float] = []
+        self._empty_slot_by_wheel: Dict[str, int] = {}  # BP wheel -> first EMPTY
+        self._available_filters: Dict[str, Tuple[str, int]] = {}
         self._build_indices()
 
+        # reused by status() so a dashboard poll doesn't spawn N threads
+        self._status_pool: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(
+                max_workers=len(wheels), thread_name_prefix="wheel-status"
+            )
+            if len(wheels) > 1
+            else None
+        )
+
+    def refresh(self) -> None:
+        """Re‑probe wheels and rebuild lookup tables, e.g. after a reconnect."""
+        self.offline = [k for k, w in self.wheels.items() if not w.is_connected()]
+        self.online = [k for k in self.wheels if k not in self.offline]
+        self._split_online()
+        self._build_indices()
+
+    def reconnect(self) -> List[str]:
+        """Retry opening offline wheels, then :meth:`refresh`; returns ``online``."""
+        for key in self.offline:
+            try:
+                self.wheels[key].connect()
+            except ThorlabsError as e:
+                _log.warning("[FilterRack] %s still offline: %s", key, e)
+        self.refresh()
+        return list(self.online)
+
+    def _split_online(self) -> None:
+        self.bp_online = [k for k in self.online if self.wheels[k].type != ND]
+        self.nd_online = [k for k in self.online if self.wheels[k].type == ND]
+
     # ------------------------------------------------------------------
     @classmethod
     def from_yaml(cls, path: str | Path) -> "FilterRack":
         """Load YAML and open wheels; wheels that fail to open are kept offline."""
         FilterWheel.list_devices()  # primes Thorlabs DLL
 
-        cfg = yaml.safe_load(Path(path).read_text())
-        wheels_cfg = cfg.get("filter_wheels", {})
-        filter_meta = cfg.get("filters", {})
+        wheels_cfg, filter_meta = _load_config(path)
 
-        wheels: Dict[str, FilterWheel] = {}
-        for key, spec in wheels_cfg.items():
-            wheel = FilterWheel(**spec)
-            try:
-                wheel.connect()
-                if not wheel.is_connected():
-                    raise ThorlabsError("wheel not detected")
-            except ThorlabsError as e:
-                warnings.warn(f"[FilterRack] {key} offline: {e}")
-            wheels[key] = wheel
+        wheels: Dict[str, FilterWheel] = {
+            key: FilterWheel(**spec) for key, spec in wheels_cfg.items()
+        }
+
+        def _open(wheel: FilterWheel) -> None:
+            wheel.connect()
+            if not wheel.is_connected():
+                raise ThorlabsError("wheel not detected")
+
+        # Each open is a slow blocking DLL call; overlap them across wheels.
+        if wheels:
+            with ThreadPoolExecutor(max_workers=len(wheels)) as ex:
+                futs = {ex.submit(_open, w): k for k, w in wheels.items()}
+                for fut in as_completed(futs):
+                    try:
+                        fut.result()
+                    except ThorlabsError as e:
+                        warnings.warn(f"[FilterRack] {futs[fut]} offline: {e}")
 
         return cls(wheels, filter_meta)
 
@@ -75,47 +160,64 @@ class FilterRack:
     # ------------------------------------------------------------------
     def _build_indices(self) -> None:
         """Populate band‑pass and ND lookup tables for **connected** wheels."""
-        for wkey, wheel in self.wheels.items():
-            if not wheel.is_connected():
-                continue
-            for slot, raw_name in wheel.filters.items():
-                if isinstance(raw_name, (int, float)):  # numeric in YAML
-                    name = str(raw_name)
-                else:
-                    name = str(raw_name)
+        for table in (
+            self._wl_index,
+            self._nd_index,
+            self._empty_slot_by_wheel,
+            self._available_filters,
+        ):
+            table.clear()
+
+        # hoist attribute lookups out of the wheels × slots loop
+        meta_get = self.meta.get
+        wl_idx = self._wl_index
+        nd_idx = self._nd_index
+        avail = self._available_filters
+
+        for wkey in self.online:
+            wheel = self.wheels[wkey]
+            empty_slots = wheel._empty_slots
+            wheel_is_nd = wheel.type == ND
+            if not wheel_is_nd:
+                for slot in wheel.filters:
+                    if slot in empty_slots:
+                        self._empty_slot_by_wheel[wkey] = slot
+                        break
 
-                if name.upper() == "EMPTY":
+            for slot, raw_name in wheel.filters.items():
+                if slot in empty_slots:
                     continue
 
-                f_meta = self.meta.get(name, {})
-                f_type = f_meta.get("type", ND if wheel.type == ND else BP)
+                name = str(raw_name)  # numeric in YAML for ND wheels
+                avail[name] = (wkey, slot)
 
-                # ----- band‑pass --------------------------------------
-                if f_type == BP and "wavelength" in f_meta:
-                    wl = float(f_meta["wavelength"])
-                    self._wl_index[wl] = (wkey, slot, name)
+                f_meta = meta_get(name, {})
+                f_type = f_meta.get("type", ND if wheel_is_nd else BP)
+                is_nd = f_type == ND
 
                 # ----- neutral density -------------------------------
-                elif f_type == ND:
+                if is_nd:
                     try:
                         # Accept 'ND 0.5', '0.5', 0.5
-                        od = float(name.split()[-1])
-                        self._nd_index[od] = (wkey, slot, name)
+                        nd_idx[float(name.split()[-1])] = (wkey, slot, name)
                     except ValueError:
                         continue
 
+                # ----- band‑pass --------------------------------------
+                elif f_type == BP and "wavelength" in f_meta:
+                    wl_idx[float(f_meta["wavelength"])] = (wkey, slot, name)
+
+        self._wl_sorted = sorted(self._wl_index)
+        self._nd_sorted = sorted(self._nd_index)
+
     # ------------------------------------------------------------------
     # Band‑pass selection
     # ------------------------------------------------------------------
     def _nearest_bp(
         self, target_nm: float, tol_nm: float
     ) -> Optional[Tuple[str, int, str]]:
-        cands = [
-            (abs(target_nm - wl), triple)
-            for wl, triple in self._wl_index.items()
-            if abs(target_nm - wl) <= tol_nm
-        ]
-        return min(cands, default=(None, None))[1]
+        wl = _nearest(self._wl_sorted, target_nm, tol_nm)
+        return None if wl is None else self._wl_index[wl]
 
     def select_bandpass(self, wl_nm: float, *, tol_nm: float = 2.0, block: bool = True):
         match = self._nearest_bp(wl_nm, tol_nm)
@@ -125,22 +227,14 @@ class FilterRack:
         tgt_key, tgt_slot, _ = match
 
         # First EMPTY slot for every other BP wheel
-        empty: Dict[str, int] = {}
-        for k, w in self.wheels.items():
-            if w.type == ND or not w.is_connected():
-                continue
-            for s, n in w.filters.items():
-                if str(n).upper() == "EMPTY":
-                    empty[k] = s
-                    break
-
-        for k, w in self.wheels.items():
-            if not w.is_connected() or w.type == ND:
-                continue
+        empty = self._empty_slot_by_wheel
+
+        for k in self.bp_online:
+            w = self.wheels[k]
             try:
                 w.move_to(tgt_slot if k == tgt_key else empty[k], block=block)
             except ThorlabsError as e:
-                warnings.warn(f"[FilterRack] {k}: {e}")
+                _log.warning("[FilterRack] %s: %s", k, e)
 
     # ------------------------------------------------------------------
     # ND selection
@@ -153,15 +247,11 @@ class FilterRack:
             raise ValueError("od must be numeric or like 'ND 0.5'")
 
         # choose closest within tolerance
-        cands = [
-            (abs(od_val - dens), triple)
-            for dens, triple in self._nd_index.items()
-            if abs(od_val - dens) <= tol
-        ]
-        if not cands:
+        dens = _nearest(self._nd_sorted, od_val, tol)
+        if dens is None:
             raise KeyError(f"No ND filter ≈{od_val} (±{tol})")
 
-        _, (wkey, slot, _) = min(cands, key=lambda t: t[0])
+        wkey, slot, _ = self._nd_index[dens]
         self.wheels[wkey].move_to(slot, block=block)
 
     # ------------------------------------------------------------------
@@ -175,19 +265,20 @@ class FilterRack:
 
     def available_filters(self) -> Dict[str, Tuple[str, int]]:
         """Return all filters present on connected wheels."""
-        out: Dict[str, Tuple[str, int]] = {}
-        for k in self.online:
-            w = self.wheels[k]
-            for slot, name in w.filters.items():
-                if str(name).upper() != "EMPTY":
-                    out[str(name)] = (k, slot)
-        return out
+        return dict(self._available_filters)
 
     def status(self) -> Dict[str, dict]:
-        """Per‑wheel status dict."""
-        return {k: w.status() for k, w in self.wheels.items()}
+        """Per‑wheel status dict (wheels are queried concurrently)."""
+        if self._status_pool is None:
+            return {k: w.status() for k, w in self.wheels.items()}
+        pool = self._status_pool
+        futs = {k: pool.submit(w.status) for k, w in self.wheels.items()}
+        return {k: f.result() for k, f in futs.items()}
 
     # ------------------------------------------------------------------
     def close(self):
+        if self._status_pool is not None:
+            self._status_pool.shutdown(wait=True)
+            self._status_pool = None
         for w in self.wheels.values():
             w.disconnect()
@@ -1,10 +1,418 @@
 # devices/labjack.py
 from __future__ import annotations
 
+import ctypes
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
 import labjack.ljm as ljm  # LabJack LJM driver
 
+try:  # raw ctypes binding, lets the batch engine pass preallocated buffers
+    from labjack.ljm.ljm import _staticLib as _LJM_LIB
+except ImportError:
+    _LJM_LIB = None
+
 from .base import BaseShutter
 
+_log = logging.getLogger(__name__)
+
+MAX_BATCH = 64  # frames per eWriteAddresses call from the batch engine
+_DIO0_ADDR = 2000  # Modbus address of DIO0/FIO0; DIOn lives at 2000 + n
+_DIO_COUNT = 23  # DIO0..DIO22, the lines covered by DIO_STATE
+
+
+class _LJMHandleRegistry:
+    """Process‑wide LJM handles keyed by device type + address, refcounted.
+
+    Every line on the same T4 shares one handle, so K shutters cost one
+    connection and their writes can be batched together.
+    """
+
+    _handles: Dict[str, Tuple[int, int]] = {}  # key -> (handle, refcount)
+    _lock = threading.Lock()
+
+    @classmethod
+    def acquire(cls, device_type: str, address: str) -> int:
+        key = f"{device_type}:{address}"
+        with cls._lock:
+            handle, refs = cls._handles.get(key, (None, 0))
+            if handle is None:
+                # First arg narrows model; second arg "ANY" lets driver pick USB/TCP; third is IP/serial.
+                handle = ljm.openS(device_type, "ANY", address)
+            cls._handles[key] = (handle, refs + 1)
+            return handle
+
+    @classmethod
+    def release(cls, device_type: str, address: str) -> bool:
+        """Drop one reference; closes the handle (and returns True) on the last."""
+        key = f"{device_type}:{address}"
+        with cls._lock:
+            handle, refs = cls._handles[key]
+            if refs > 1:
+                cls._handles[key] = (handle, refs - 1)
+                return False
+            del cls._handles[key]
+            ljm.close(handle)
+            return True
+
+
+class _Op(NamedTuple):
+    addr: int
+    dtype: int
+    value: float
+    future: Future
+
+
+def _resolved() -> Future:
+    fut: Future = Future()
+    fut.set_result(None)
+    return fut
+
+
+class LJMBatchEngine:
+    """Background writer for one LJM handle.
+
+    A daemon thread drains whatever writes have queued up (at most
+    *max_batch*), sends them in one ``eWriteAddresses`` call and resolves
+    each op's :class:`~concurrent.futures.Future`.  Callers only pay for a
+    queue put; bursts coalesce into a single Modbus transaction.
+
+    With ``max_coalesce_usecs > 0`` writes are also debounced: a write is
+    held for that long, later writes to the same line replace it, and a
+    toggle back to the last value actually sent cancels it outright.  Held
+    writes go out together once the oldest one is due or
+    ``max_coalesce_count`` lines are pending.
+    """
+
+    def __init__(
+        self,
+        handle: int,
+        *,
+        max_batch: int = MAX_BATCH,
+        max_coalesce_usecs: int = 0,
+        max_coalesce_count: int = MAX_BATCH,
+    ) -> None:
+        self.handle = handle
+        self.max_batch = max_batch
+        self.max_coalesce_usecs = max_coalesce_usecs
+        self.max_coalesce_count = min(max_coalesce_count, max_batch)
+        # argument arrays reused for every call instead of rebuilt per batch
+        self._addrs_buf = (ctypes.c_int32 * max_batch)()
+        self._types_buf = (ctypes.c_int32 * max_batch)()
+        self._vals_buf = (ctypes.c_double * max_batch)()
+        self._err_addr = ctypes.c_int32(-1)
+        self._committed: Dict[int, float] = {}  # addr -> last value sent
+        self.q: "queue.Queue[Optional[_Op]]" = queue.Queue()
+        run = self._run_debounced if max_coalesce_usecs > 0 else self._run
+        self._thread = threading.Thread(
+            target=run, name=f"ljm-writer-{handle}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, addr: int, dtype: int, value: float) -> Future:
+        fut: Future = Future()
+        self.q.put(_Op(addr, dtype, value, fut))
+        return fut
+
+    def join(self) -> None:
+        """Block until every submitted write has been sent (or cancelled)."""
+        self.q.join()
+
+    def stop(self) -> None:
+        self.q.put(None)
+        self._thread.join()
+
+    # ---------- worker loops -------------------------------------------
+    def _run(self) -> None:
+        while True:
+            op = self.q.get()
+            if op is None:
+                self.q.task_done()
+                return
+            ops = [op]
+            stop = False
+            while len(ops) < self.max_batch:
+                try:
+                    nxt = self.q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    self.q.task_done()
+                    break
+                ops.append(nxt)
+            self._send(ops)
+            if stop:
+                return
+
+    def _run_debounced(self) -> None:
+        window = self.max_coalesce_usecs / 1e6
+        # addr -> (dtype, value, deadline, ops folded into this write)
+        pending: Dict[int, Tuple[int, float, float, List[_Op]]] = {}
+        while True:
+            timeout = None
+            if pending:
+                due = min(p[2] for p in pending.values())
+                timeout = max(0.0, due - time.monotonic())
+            try:
+                op = self.q.get(timeout=timeout)
+            except queue.Empty:
+                self._flush_pending(pending)
+                continue
+            if op is None:
+                self._flush_pending(pending)
+                self.q.task_done()
+                return
+
+            cur = pending.get(op.addr)
+            if cur is None:
+                deadline = time.monotonic() + window
+                pending[op.addr] = (op.dtype, op.value, deadline, [op])
+            else:
+                _, held, deadline, ops = cur
+                ops.append(op)
+                committed = self._committed.get(op.addr)
+                if committed == op.value and held != committed:
+                    # toggled back within the window: net no‑op, drop it
+                    del pending[op.addr]
+                    self._finish(self._claim(ops))
+                else:
+                    pending[op.addr] = (op.dtype, op.value, deadline, ops)
+            # flush on count, or when the oldest write is due even if the
+            # queue never runs dry long enough for get() to time out
+            if len(pending) >= self.max_coalesce_count or (
+                pending
+                and min(p[2] for p in pending.values()) <= time.monotonic()
+            ):
+                self._flush_pending(pending)
+
+    # ---------- sending ------------------------------------------------
+    def _send(self, ops: List[_Op]) -> None:
+        ops = self._claim(ops)
+        if not ops:
+            return
+        try:
+            # frames execute in order, so a queued open→close pulse is preserved
+            for i, op in enumerate(ops):
+                self._addrs_buf[i] = op.addr
+                self._types_buf[i] = op.dtype
+                self._vals_buf[i] = op.value
+            self._write_frames(len(ops))
+        except Exception as e:
+            self._finish(ops, e)
+        else:
+            self._finish(ops)
+
+    def _flush_pending(
+        self, pending: Dict[int, Tuple[int, float, float, List[_Op]]]
+    ) -> None:
+        if not pending:
+            return
+        items = list(pending.values())
+        pending.clear()
+        frames: List[_Op] = []  # latest live op per address
+        ops: List[_Op] = []
+        for _, _, _, folded in items:
+            live = self._claim(folded)
+            if live:
+                frames.append(live[-1])
+                ops.extend(live)
+        if not frames:
+            return
+        try:
+            for i, op in enumerate(frames):
+                self._addrs_buf[i] = op.addr
+                self._types_buf[i] = op.dtype
+                self._vals_buf[i] = op.value
+            self._write_frames(len(frames))
+        except Exception as e:
+            self._finish(ops, e)
+            return
+        for op in frames:
+            self._committed[op.addr] = op.value
+        self._finish(ops)
+
+    def _claim(self, ops: List[_Op]) -> List[_Op]:
+        """Mark *ops* running; ones the caller already cancelled are dropped."""
+        live: List[_Op] = []
+        for op in ops:
+            if op.future.set_running_or_notify_cancel():
+                live.append(op)
+            else:
+                self.q.task_done()
+        return live
+
+    def _finish(self, ops: List[_Op], exc: Optional[BaseException] = None) -> None:
+        for op in ops:
+            try:
+                if exc is None:
+                    op.future.set_result(None)
+                else:
+                    op.future.set_exception(exc)
+            finally:
+                self.q.task_done()
+
+    def _write_frames(self, n: int) -> None:
+        if _LJM_LIB is None:  # no ctypes binding: go through the list wrapper
+            ljm.eWriteAddresses(
+                self.handle,
+                n,
+                self._addrs_buf[:n],
+                self._types_buf[:n],
+                self._vals_buf[:n],
+            )
+            return
+        self._err_addr.value = -1
+        err = _LJM_LIB.LJM_eWriteAddresses(
+            self.handle,
+            ctypes.c_int32(n),
+            ctypes.byref(self._addrs_buf),
+            ctypes.byref(self._types_buf),
+            ctypes.byref(self._vals_buf),
+            ctypes.byref(self._err_addr),
+        )
+        if err != ljm.errorcodes.NOERROR:
+            err_addr = self._err_addr.value
+            raise ljm.LJMError(err, None if err_addr == -1 else err_addr)
+
+
+class LabJackBus:
+    """Write batcher for one shared LJM handle (see :class:`_LJMHandleRegistry`).
+
+    Writes are queued per Modbus address (last value wins) and sent together
+    in a single ``eWriteAddresses`` transaction by :meth:`flush`.  Outside a
+    :meth:`batch` block callers flush immediately; inside one, everything
+    queued is sent as one transaction when the outermost block exits.  A
+    batch belongs to the thread that opened it; other threads' writes wait
+    until it exits::
+
+        with bus.batch():
+            shutter_a.open()
+            shutter_b.close()
+    """
+
+    _buses: Dict[int, "LabJackBus"] = {}
+
+    def __init__(self, handle: int) -> None:
+        self.handle = handle
+        self._pending: Dict[int, Tuple[int, float]] = {}  # addr -> (type, value)
+        self._on_fail: List[Callable[[], None]] = []  # run if the flush raises
+        self._batch_depth = 0
+        self._lock = threading.RLock()
+        self._engine: LJMBatchEngine | None = None
+
+    @classmethod
+    def for_handle(cls, handle: int) -> "LabJackBus":
+        bus = cls._buses.get(handle)
+        if bus is None:
+            bus = cls._buses.setdefault(handle, cls(handle))
+        return bus
+
+    @classmethod
+    def discard(cls, handle: int) -> None:
+        """Forget the bus of a handle that has been closed."""
+        bus = cls._buses.pop(handle, None)
+        if bus is not None and bus._engine is not None:
+            bus._engine.stop()
+
+    def engine(self, **engine_kw) -> LJMBatchEngine:
+        """Background writer for this handle, started on first use.
+
+        *engine_kw* (e.g. ``max_coalesce_usecs``) configure the engine when it
+        is created; asking for different settings later raises ``ValueError``.
+        """
+        with self._lock:
+            if self._engine is None:
+                self._engine = LJMBatchEngine(self.handle, **engine_kw)
+                return self._engine
+            for key, val in engine_kw.items():
+                have = getattr(self._engine, key)
+                if key == "max_coalesce_count":
+                    val = min(val, self._engine.max_batch)
+                if have != val:
+                    raise ValueError(
+                        f"LJM writer for handle {self.handle} already running "
+                        f"with {key}={have!r} (requested {val!r})"
+                    )
+            return self._engine
+
+    def sync(self) -> None:
+        """Send queued writes and wait for the background writer to drain."""
+        self.flush()
+        if self._engine is not None:
+            self._engine.join()
+
+    # ---------- batched writes -----------------------------------------
+    @property
+    def batching(self) -> bool:
+        return self._batch_depth > 0
+
+    def queue(
+        self,
+        addr: int,
+        dtype: int,
+        value: float,
+        on_fail: Callable[[], None] | None = None,
+    ) -> None:
+        """Queue one write; *on_fail* is called if the flush sending it raises."""
+        with self._lock:
+            self._pending[addr] = (dtype, value)
+            if on_fail is not None:
+                self._on_fail.append(on_fail)
+
+    def write(
+        self,
+        addr: int,
+        dtype: int,
+        value: float,
+        on_fail: Callable[[], None] | None = None,
+    ) -> None:
+        """Queue one write and send it now unless inside :meth:`batch`."""
+        with self._lock:
+            self.queue(addr, dtype, value, on_fail)
+            if not self._batch_depth:
+                self.flush()
+
+    def flush(self) -> None:
+        """Send every queued write in one LJM transaction."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            on_fail, self._on_fail = self._on_fail, []
+        if not pending:
+            return
+        try:
+            if len(pending) == 1:
+                ((addr, (dtype, value)),) = pending.items()
+                ljm.eWriteAddress(self.handle, addr, dtype, value)
+                return
+            addrs = list(pending)
+            dtypes = [t for t, _ in pending.values()]
+            values = [v for _, v in pending.values()]
+            ljm.eWriteAddresses(self.handle, len(addrs), addrs, dtypes, values)
+        except Exception:
+            for cb in on_fail:
+                cb()
+            raise
+
+    @contextmanager
+    def batch(self) -> Iterator["LabJackBus"]:
+        # the bus lock is held for the whole block: writes from other
+        # threads (one per Pyro connection) wait and go out on their own
+        # instead of being swallowed into this batch
+        with self._lock:
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self.flush()
+
 
 class LabJackT4Shutter(BaseShutter):
     """Digital‑line shutter driver for a LabJack T4.
@@ -19,8 +427,32 @@ class LabJackT4Shutter(BaseShutter):
         If *True* the shutter **opens** when the line is driven high (1 VIO).  If *False* line‑high means *closed*.
     name : str, optional
         Friendly identifier used in logs/status (defaults to "shutter").
+    use_async : bool, optional
+        If *True*, ``open()``/``close()`` hand the write to a background
+        :class:`LJMBatchEngine` and return a ``Future`` instead of blocking.
+    max_coalesce_usecs, max_coalesce_count : int, optional
+        Debounce settings for that engine (see :class:`LJMBatchEngine`).
+        Shutters sharing a T4 must agree on them.
     """
 
+    __slots__ = (
+        "name",
+        "address",
+        "line",
+        "active_high",
+        "use_async",
+        "max_coalesce_usecs",
+        "max_coalesce_count",
+        "_on",
+        "_off",
+        "_bus",
+        "_handle",
+        "_addr",
+        "_type",
+        "_state",
+        "_last_fut",
+    )
+
     def __init__(
         self,
         address: str = "ANY",
@@ -28,13 +460,27 @@ class LabJackT4Shutter(BaseShutter):
         line: str = "FIO4",
         active_high: bool = True,
         name: str = "shutter",
+        use_async: bool = False,
+        max_coalesce_usecs: int = 0,
+        max_coalesce_count: int = MAX_BATCH,
     ) -> None:
         self.name = name
+        self.use_async = use_async
+        self.max_coalesce_usecs = max_coalesce_usecs
+        self.max_coalesce_count = max_coalesce_count
         self.address = address
         self.line = line
         self.active_high = active_high
+        # physical levels for open/closed, fixed at construction
+        self._on = 1 if active_high else 0
+        self._off = 1 - self._on
+        self._bus: LabJackBus | None = None
         self._handle: int | None = None
-        self._state: bool = False  # logical state: True=open
+        self._addr: int | None = None  # Modbus address/type of *line*
+        self._type: int | None = None
+        # logical state: True=open; None until first write (line level unknown)
+        self._state: bool | None = None
+        self._last_fut: Future | None = None  # newest async write
 
         # connect to the LabJack on instantiation
         self.connect()
@@ -43,24 +489,42 @@ class LabJackT4Shutter(BaseShutter):
     # BaseDevice API
     # ------------------------------------------------------------------
     def connect(self) -> None:
-        """Open the LabJack.  Safe to call twice."""
-        if self._handle is None:
-            # First arg "T4" narrows model; second arg "ANY" lets driver pick USB/TCP; third is IP/serial.
-            self._handle = ljm.openS("T4", "ANY", self.address)
+        """Open the LabJack (shared with other lines on it).  Safe to call twice."""
+        if self._bus is None:
+            self._handle = _LJMHandleRegistry.acquire("T4", self.address)
+            self._bus = LabJackBus.for_handle(self._handle)
+            # resolve the register once instead of per write
+            self._addr, self._type = ljm.nameToAddress(self.line)
 
     def disconnect(self) -> None:
-        if self._handle:
-            ljm.close(self._handle)
+        if self._bus is not None:
+            self._bus.sync()
+            if _LJMHandleRegistry.release("T4", self.address):
+                LabJackBus.discard(self._handle)
+            self._bus = None
             self._handle = None
 
+    @property
+    def bus(self) -> LabJackBus | None:
+        """Shared bus, e.g. ``with shutter.bus.batch(): ...`` to group writes."""
+        return self._bus
+
     def is_connected(self) -> bool:
         return self._handle is not None
 
     def status(self) -> dict:
-        """Return a lightweight status dict for dashboards / RPC calls."""
+        """Return a lightweight status dict for dashboards / RPC calls.
+
+        Built from cached state only; use :meth:`refresh` to read the device.
+        """
         return {
+            "name": self.name,
             "connected": self.is_connected(),
-            "state": "open" if self._state else "closed",
+            "state": (
+                "unknown"
+                if self._state is None
+                else "open" if self._state else "closed"
+            ),
             "line": self.line,
             "address": self.address,
         }
@@ -68,20 +532,82 @@ class LabJackT4Shutter(BaseShutter):
     # ------------------------------------------------------------------
     # BaseShutter API
     # ------------------------------------------------------------------
-    def _write_line(self, logical_open: bool) -> None:
-        if not self.is_connected():
+    def open(self, *, force: bool = False) -> Future | None:
+        """Open the shutter; no‑op if already open unless *force*."""
+        if self._state is True and not force:
+            return _resolved() if self.use_async else None
+        if self._bus is None:
             raise RuntimeError("LabJack shutter not connected")
-        physical_level = 1 if logical_open == self.active_high else 0
-        print(f"Setting {self.line} to {physical_level}")
-        ljm.eWriteName(self._handle, self.line, physical_level)
-
-    def open(self) -> None:
-        self._write_line(True)
+        _log.debug("Setting %s to %d", self.line, self._on)
+        if self.use_async:
+            fut = self._engine().submit(self._addr, self._type, self._on)
+            self._state = True
+            self._last_fut = fut
+            fut.add_done_callback(self._on_async_done)
+            return fut
+        # inside a batch the write is only queued; a failed flush at block
+        # exit resets the state through _forget_state
+        self._bus.write(self._addr, self._type, self._on, self._forget_state)
         self._state = True
+        return None
 
-    def close(self) -> None:
-        self._write_line(False)
+    def close(self, *, force: bool = False) -> Future | None:
+        """Close the shutter; no‑op if already closed unless *force*."""
+        if self._state is False and not force:
+            return _resolved() if self.use_async else None
+        if self._bus is None:
+            raise RuntimeError("LabJack shutter not connected")
+        _log.debug("Setting %s to %d", self.line, self._off)
+        if self.use_async:
+            fut = self._engine().submit(self._addr, self._type, self._off)
+            self._state = False
+            self._last_fut = fut
+            fut.add_done_callback(self._on_async_done)
+            return fut
+        # inside a batch the write is only queued; a failed flush at block
+        # exit resets the state through _forget_state
+        self._bus.write(self._addr, self._type, self._off, self._forget_state)
         self._state = False
+        return None
+
+    def _engine(self) -> LJMBatchEngine:
+        return self._bus.engine(
+            max_coalesce_usecs=self.max_coalesce_usecs,
+            max_coalesce_count=self.max_coalesce_count,
+        )
+
+    def _forget_state(self) -> None:
+        self._state = None
+
+    def _on_async_done(self, fut: Future) -> None:
+        # a failed or cancelled write leaves the line level unknown, so the
+        # next open()/close() is not swallowed by the no‑op guard; only the
+        # newest write decides, an older one is superseded by it anyway
+        if fut is not self._last_fut:
+            return
+        if fut.cancelled() or fut.exception() is not None:
+            self._state = None
 
     def get_state(self) -> bool:
+        """True if open.  False before the first write (see ``status()``)."""
+        return self._state is True
+
+    def refresh(self) -> bool:
+        """Read the line level back from the T4 and update the cached state.
+
+        Reads the ``DIO_STATE`` bitmask: reading the ``FIOx`` register itself
+        would switch the line to an input.
+        """
+        if self._bus is None:
+            raise RuntimeError("LabJack shutter not connected")
+        bit = self._addr - _DIO0_ADDR
+        if not 0 <= bit < _DIO_COUNT:
+            raise ValueError(
+                f"cannot read back {self.line!r}: not a digital I/O line "
+                f"(Modbus address {self._addr})"
+            )
+        self._bus.sync()
+        mask = int(ljm.eReadName(self._handle, "DIO_STATE"))
+        level = (mask >> bit) & 1
+        self._state = level == self._on
         return self._state
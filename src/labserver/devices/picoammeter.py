@@ -1,14 +1,49 @@
 # labserver/devices/picoammeter.py   (rev 5 – direct port of working script)
 from __future__ import annotations
 
+import math
 import time
-from typing import Optional
+from typing import Optional, Tuple
 
 import numpy as np
 import serial
 
 from .base import BaseAmmeter
 
+# exact command sequence from working script, encoded once at import
+_CONFIG_CMDS: tuple[bytes, ...] = tuple(
+    (c + "\r").encode()
+    for c in (
+        "*RST",
+        ":FORM:ELEM READ",
+        "TRIG:DEL 0",
+        "TRIG:COUNT 1",
+        "SENS:CURR:NPLC 6",
+        "SENS:CURR:RANG 0.000002",
+        "SENS:CURR:RANG:AUTO ON",
+        "SYST:ZCOR ON",
+        "SYST:AZER:STAT OFF",
+        "DISP:ENAB ON",
+        ":SYST:ZCH:STAT OFF",
+    )
+)
+_OPC_CMD = b"*OPC?\r"
+_READ_CMD = b"READ?\r"
+
+
+def _summary_stats(x: np.ndarray) -> Tuple[float, float, float]:
+    """Mean, median and (population) std of *x* without a full sort."""
+    n = x.size
+    if n == 0:
+        return math.nan, math.nan, math.nan
+    mean = float(x.sum()) / n
+    d = x - mean  # centred pass keeps the variance stable for ~nA offsets
+    std = math.sqrt(float(np.dot(d, d)) / n)
+    k = n // 2
+    part = np.partition(x, (k - 1, k) if n % 2 == 0 else k)
+    median = float(part[k]) if n % 2 else 0.5 * float(part[k - 1] + part[k])
+    return mean, median, std
+
 
 class MultiSampleResult:
     def __init__(
@@ -48,43 +83,41 @@ class PicoAmmeter(BaseAmmeter):
         port: str,
         baudrate: int = 9600,
         timeout: float = 2.0,
+        min_gap_s: float = 0.0,
     ):
         self.port = port
         self.baudrate = baudrate
         self.timeout = timeout
+        self.min_gap_s = min_gap_s  # optional pacing between commands
         self._ser: Optional[serial.Serial] = None
+        self._last_tx: float = 0.0
+        self._last_current: Optional[float] = None  # most recent reading (A)
 
     # ---------------- low‑level helpers ------------------------------
-    def _send(self, cmd: str):
+    def _send(self, cmd: bytes):
         if not self._ser or not self._ser.is_open:
             raise RuntimeError("ammeter not connected")
-        self._ser.write((cmd + "\r").encode())
+        if self.min_gap_s:
+            wait = self._last_tx + self.min_gap_s - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+        self._ser.write(cmd)
         self._ser.flush()
-        time.sleep(0.1)  # same pacing as script
+        self._last_tx = time.monotonic()
 
-    def _query(self, cmd: str) -> str:
+    def _query(self, cmd: bytes) -> bytes:
+        """Send *cmd* and return the raw reply line (terminator included)."""
         self._send(cmd)
-        return self._ser.readline().decode().strip()
+        return self._ser.read_until(b"\n", size=64)
 
     # ---------------- initialisation ---------------------------------
     def _configure(self):
-        # exact command sequence from working script
-        cmds = (
-            "*RST",
-            ":FORM:ELEM READ",
-            "TRIG:DEL 0",
-            "TRIG:COUNT 1",
-            "SENS:CURR:NPLC 6",
-            "SENS:CURR:RANG 0.000002",
-            "SENS:CURR:RANG:AUTO ON",
-            "SYST:ZCOR ON",
-            "SYST:AZER:STAT OFF",
-            "DISP:ENAB ON",
-            ":SYST:ZCH:STAT OFF",
-        )
-        for c in cmds:
+        for c in _CONFIG_CMDS:
             self._send(c)
-        time.sleep(0.5)  # settle, like script
+        # block until the instrument has processed the whole sequence
+        resp = self._query(_OPC_CMD)
+        if resp.strip() != b"1":
+            raise RuntimeError(f"ammeter did not confirm configuration: {resp!r}")
 
     # ---------------- public API -------------------------------------
     def connect(self):
@@ -101,7 +134,13 @@ class PicoAmmeter(BaseAmmeter):
             rtscts=False,
             dsrdtr=False,
         )
-        self._configure()
+        try:
+            self._configure()
+        except Exception:
+            # don't leave a half‑configured port open (is_connected() would
+            # lie and the next connect() would return early)
+            self.disconnect()
+            raise
 
     def disconnect(self):
         if self._ser and self._ser.is_open:
@@ -115,7 +154,7 @@ class PicoAmmeter(BaseAmmeter):
         """Trigger one reading exactly like the test script (`READ?`)."""
         if not self.is_connected():
             raise RuntimeError("ammeter not connected")
-        resp = self._query("READ?")
+        resp = self._query(_READ_CMD)
         try:
             cur = float(resp)
             self._last_current = cur
@@ -124,30 +163,38 @@ class PicoAmmeter(BaseAmmeter):
             self._last_current = np.nan
             raise RuntimeError(f"Bad ammeter response: {resp!r}") from exc
 
+    @property
+    def last_current(self) -> Optional[float]:
+        """Most recent reading from ``read_current()`` (None before the first)."""
+        return self._last_current
+
     def read_multisample(
         self, n: int, dt: float = 0.1, return_arr: bool = True
     ) -> MultiSampleResult:
         """Read `n` samples, returning a MultiSampleResult."""
         if not self.is_connected():
             raise RuntimeError("ammeter not connected")
-        samples = []
-        times = []
-        for _ in range(n):
-            samples.append(self.read_current())
-            times.append(time.time())
-            time.sleep(dt)
-
-        mean = np.mean(samples)
-        median = np.median(samples)
-        std = np.std(samples)
+        samples = np.empty(n, dtype=np.float64)
+        times = np.empty(n, dtype=np.float64)
+        # pace against absolute ticks so query time eats into the dt budget
+        t0 = time.perf_counter()
+        for i in range(n):
+            samples[i] = self.read_current()
+            times[i] = time.time()
+            rem = t0 + (i + 1) * dt - time.perf_counter()
+            if rem > 0:
+                time.sleep(rem)
+
+        # plain floats/lists so the result serialises without a numpy pass
+        mean, median, std = _summary_stats(samples)
 
         res = MultiSampleResult(
             n_samples=n,
             mean=mean,
             median=median,
             std=std,
-            samples=samples if return_arr else None,
-            times=times if return_arr else None,
+            samples=samples.tolist() if return_arr else None,
+            times=times.tolist() if return_arr else None,
         )
 
         return res
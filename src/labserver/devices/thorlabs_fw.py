@@ -18,10 +18,19 @@ from typing import Dict, List, Optional, Tuple
 
 import yaml
 
+try:  # libyaml C bindings are much faster when available
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
 from . import FWxC_COMMAND_LIB as fwx  # Thorlabs helper (with DLL already loaded)
 
 __all__ = ["ThorlabsError", "FilterWheel", "load_wheels_from_yaml"]
 
+_ALIVE_TTL_S = 0.5  # reuse a handle‑alive probe for this long
+_STATUS_TTL_S = 0.2  # reuse a status() snapshot for this long
+_DLL_PRIMED = False  # set after the first USB enumeration
+
 
 class ThorlabsError(RuntimeError):
     """Raised when the Thorlabs DLL returns a negative status code."""
@@ -31,17 +40,27 @@ class ThorlabsError(RuntimeError):
 # FilterWheel class
 # -----------------------------------------------------------------------------
 class FilterWheel:
+    _cached_devices: List[str] = []
+
     # ---------- low‑level class helpers ------------------------------------
     @classmethod
-    def list_devices(cls) -> List[str]:
+    def list_devices(cls, force: bool = False) -> List[str]:
+        """Enumerate attached wheels; cached after the first call unless *force*."""
+        global _DLL_PRIMED
+        if _DLL_PRIMED and not force:
+            return list(cls._cached_devices)
         devices = fwx.FWxCListDevices()
         try:
             if isinstance(devices, bytes):
                 txt = devices.decode("utf-8").strip()
-                return [d for d in txt.replace(",", " ").split() if d]
-            return [dev[0] for dev in devices]
+                result = [d for d in txt.replace(",", " ").split() if d]
+            else:
+                result = [dev[0] for dev in devices]
         except Exception:
-            return [dev[0] for dev in devices]
+            result = [dev[0] for dev in devices]
+        _DLL_PRIMED = True
+        cls._cached_devices = result
+        return list(result)
 
     @classmethod
     def open_device(
@@ -101,19 +120,41 @@ class FilterWheel:
         self.type = type or "unknown"
         self.filters = {int(k): (v or "EMPTY") for k, v in (filters or {}).items()}
 
+        # Name lookups precomputed once; filters are fixed after construction
+        self._empty_slots: frozenset[int] = frozenset(
+            s for s, n in self.filters.items() if str(n).upper() == "EMPTY"
+        )
+        self._lower_to_slot: Dict[str, int] = {}
+        for s, n in self.filters.items():
+            self._lower_to_slot.setdefault(str(n).casefold(), s)
+
         self._hdl: Optional[int] = None
         self._lock = threading.RLock()
+        self._alive_ts: float = 0.0  # monotonic time of last liveness probe
+        self._alive_val: bool = False
+        self._status_cache: Optional[Tuple[float, dict]] = None
 
     # ---------- internal helpers -----------------------------------------
     def _handle_alive(self) -> bool:
         if self._hdl is None:
             return False
+        now = time.monotonic()
+        if now - self._alive_ts < _ALIVE_TTL_S:
+            return self._alive_val
         try:
             # Quick harmless command:
-            _ = self.get_position_raw(self._hdl)
-            return True
+            with self._lock:
+                _ = self.get_position_raw(self._hdl)
+            alive = True
         except Exception:
-            return False
+            alive = False
+        self._alive_ts, self._alive_val = now, alive
+        return alive
+
+    def _invalidate_alive(self) -> None:
+        """Force the next liveness/status check to talk to the device."""
+        self._alive_ts = 0.0
+        self._status_cache = None
 
     def _safe_reopen(self) -> None:
         """Close stale handle if present, then try a fresh open."""
@@ -130,6 +171,7 @@ class FilterWheel:
     # ---------- public connection API ------------------------------------
     def connect(self, *, force: bool = False) -> None:
         with self._lock:
+            self._invalidate_alive()
             if self._hdl and not force and self._handle_alive():
                 return
             try:
@@ -140,9 +182,12 @@ class FilterWheel:
                     self._safe_reopen()
                 else:
                     raise
+            finally:
+                self._invalidate_alive()
 
     def disconnect(self) -> None:
         with self._lock:
+            self._invalidate_alive()
             if self._hdl:
                 try:
                     self.close_device(self._hdl)
@@ -159,43 +204,79 @@ class FilterWheel:
             raise ValueError(f"slot {slot} out of range 0‑{self.slots}")
         if not self.is_connected():
             raise ThorlabsError("wheel not connected")
-        self.set_position_raw(self._hdl, slot)
+        try:
+            with self._lock:
+                self.set_position_raw(self._hdl, slot)
+        except ThorlabsError:
+            self._invalidate_alive()
+            raise
+        self._status_cache = None
         if not block:
             return
         deadline = time.monotonic() + (timeout or self.timeout_s)
+        # short first waits catch quick moves; back off towards poll_s
+        interval = min(0.01, self.poll_s)
         while time.monotonic() < deadline:
-            if self.get_position() == slot:
-                return
-            time.sleep(self.poll_s)
+            try:
+                # lock per DLL call, not per move, so status() polls interleave
+                with self._lock:
+                    pos = self.get_position_raw(self._hdl)
+                if pos == slot:
+                    return
+            except ThorlabsError:
+                self._invalidate_alive()
+                raise
+            time.sleep(interval)
+            interval = min(interval * 1.6, self.poll_s)
         raise TimeoutError(f"Timed out waiting for slot {slot}")
 
     def get_position(self) -> int:
         if not self.is_connected():
             raise ThorlabsError("wheel not connected")
-        return self.get_position_raw(self._hdl)
+        try:
+            with self._lock:
+                return self.get_position_raw(self._hdl)
+        except ThorlabsError:
+            self._invalidate_alive()
+            raise
 
     # ---------- filter helpers ------------------------------------------
     def list_filters(self) -> Dict[int, str]:
         return dict(self.filters)
 
     def move_to_filter(self, name: str, **move_kw):
-        target = name.lower()
-        for s, fname in self.filters.items():
-            if fname.lower() == target:
-                self.move_to(s, **move_kw)
-                return
-        raise KeyError(f"Filter '{name}' not found on wheel SN{self.serial}")
+        slot = self._lower_to_slot.get(str(name).casefold())
+        if slot is None:
+            raise KeyError(f"Filter '{name}' not found on wheel SN{self.serial}")
+        self.move_to(slot, **move_kw)
 
     # ---------- status ---------------------------------------------------
     def status(self) -> dict:
-        pos = self.get_position() if self.is_connected() else None
-        return {
+        now = time.monotonic()
+        cached = self._status_cache
+        if cached is not None and now - cached[0] < _STATUS_TTL_S:
+            return dict(cached[1])
+
+        # One DLL call answers both "connected?" and "where?"
+        pos: Optional[int] = None
+        with self._lock:  # serialise with move_to on the same handle
+            if self._hdl is not None:
+                try:
+                    pos = self.get_position_raw(self._hdl)
+                except ThorlabsError:
+                    pos = None
+        connected = pos is not None
+        self._alive_ts, self._alive_val = now, connected
+
+        result = {
             "serial": self.serial,
-            "connected": self.is_connected(),
+            "connected": connected,
             "position": pos,
             "current_filter": self.filters.get(pos, "UNKNOWN") if pos else None,
             "type": self.type,
         }
+        self._status_cache = (now, result)
+        return dict(result)
 
     # ---------- context manager -----------------------------------------
     def __enter__(self):
@@ -212,7 +293,8 @@ class FilterWheel:
 def load_wheels_from_yaml(
     path: str | Path,
 ) -> Tuple[Dict[str, FilterWheel], Dict[str, List[Tuple[str, int]]]]:
-    cfg = yaml.safe_load(Path(path).read_text())
+    with open(path, "rb") as f:
+        cfg = yaml.load(f, Loader=_Loader)
     wheels_cfg = cfg.get("filter_wheels", {})
     wheels: Dict[str, FilterWheel] = {}
     index: Dict[str, List[Tuple[str, int]]] = {}
@@ -221,7 +303,7 @@ def load_wheels_from_yaml(
         wheel = FilterWheel(**spec)
         wheels[key] = wheel
         for slot, fname in wheel.filters.items():
-            if fname and fname.upper() != "EMPTY":
-                index.setdefault(fname.lower(), []).append((key, slot))
+            if slot not in wheel._empty_slots:
+                index.setdefault(str(fname).lower(), []).append((key, slot))
 
     return wheels, index
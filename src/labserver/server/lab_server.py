@@ -3,6 +3,16 @@ labserver/server/lab_server.py  (rev 4)
 
 Pyro5 daemon exposing wheels, shutter, and (optionally) an ammeter.
 The server starts even if the ammeter COM port is absent.
+
+The daemon answers in whatever serializer the client speaks.  For large
+``read_multisample_current`` payloads, use msgpack on that proxy (floats go
+over the wire as 8‑byte binary instead of serpent text):
+
+    lab = Pyro5.api.Proxy(uri)
+    lab._pyroSerializer = "msgpack"
+
+Keep the default (serpent) for ``wheel_filters``: msgpack rejects its
+integer dict keys on decode.
 """
 
 from __future__ import annotations
@@ -22,7 +32,6 @@ from labserver.config import CONFIG_DIR
 from labserver.devices.filter_rack import FilterRack
 from labserver.devices.labjack import LabJackT4Shutter
 from labserver.devices.picoammeter import BaseAmmeter, PicoAmmeter
-from labserver.util.serialization import sanitize_for_serialization
 
 
 @pyro.expose  # expose every public method in the class
@@ -78,6 +87,10 @@ class LabServer:
     def available_filters(self):
         return self.rack.available_filters()
 
+    def reconnect_wheels(self):
+        """Retry offline wheels and rebuild the filter lookup tables."""
+        return self.rack.reconnect()
+
     # ---------- ND wheel ----------------------------------------------
     def set_nd(self, od_value, tol: float = 0.05):
         """Place requested ND filter (e.g. 0.5) in the beam path."""
@@ -108,6 +121,7 @@ class LabServer:
             raise ValueError("action must be 'open' or 'close'")
 
     def read_current(self):
+        """Take a fresh ammeter reading (``status()`` only reports the last one)."""
         if self.ammeter and self.ammeter.is_connected():
             return self.ammeter.read_current()
         raise RuntimeError("Ammeter not connected")
@@ -128,7 +142,7 @@ class LabServer:
 
         if self.ammeter and self.ammeter.is_connected():
             res = self.ammeter.read_multisample(n, dt, return_arr)
-            return sanitize_for_serialization(res.dict())
+            return res.dict()  # already native Python types
         raise RuntimeError("Ammeter not connected")
 
     # ---------- aggregated status -------------------------------------
@@ -136,10 +150,11 @@ class LabServer:
         return {
             "wheels": self.rack.status(),
             "shutter": self._shutter.status(),
+            # last cached reading; call read_current() for a fresh sample
             "ammeter_A": (
                 None
                 if self.ammeter is None or not self.ammeter.is_connected()
-                else self.ammeter.read_current()
+                else self.ammeter.last_current
             ),
             "offline_wheels": self.rack.offline,
             "online_wheels": self.rack.online,